@@ -14,6 +14,31 @@ Date Created: May 10, 2025
 import openai  # For interacting with OpenAI's API
 import json  # For parsing JSON responses from the LLM
 import re  # For cleaning JSON strings
+import time  # For measuring how long each API call takes
+import hashlib  # For building stable keys for recorded responses
+
+def prompt_key(model: str, prompt: str, temperature: float = 0.0) -> str:
+    """
+    Build a stable key identifying one request to the LLM.
+    
+    Args:
+        model (str): The LLM model name.
+        prompt (str): The fully formatted prompt.
+        temperature (float): The sampling temperature.
+    
+    Returns:
+        str: A SHA-256 hex digest of the model, temperature, and prompt.
+    """
+    raw = f"{model}\n{temperature}\n{prompt}"
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+class ResponseParseError(Exception):
+    """
+    Raised when the LLM response can't be parsed as JSON.
+    
+    Kept separate from other errors so callers (e.g., the eval harness) can tell
+    a badly formatted response apart from an API failure.
+    """
 
 class SimpleAgent:
     """
@@ -23,59 +48,133 @@ class SimpleAgent:
     It's designed to be simple and reusable for various tasks.
     """
     
-    def __init__(self, api_key: str, model: str = "gpt-3.5-turbo"):
+    def __init__(self, api_key: str, model: str = "gpt-3.5-turbo", cache=None):
         """
         Initialize the agent with an API key and model.
         
         Args:
             api_key (str): OpenAI API key for authentication.
             model (str): The LLM model to use (default: gpt-3.5-turbo).
+            cache (ResponseCache): Optional cache of pre-warmed responses (see cache.py and precompute.py).
         """
         # Set the API key for OpenAI's client
         # This authenticates all API requests
         openai.api_key = api_key
         # Store the model name (e.g., gpt-3.5-turbo)
         self.model = model
+        # Store the pre-warmed response cache (None means always call the API)
+        # The agent only reads from it; precompute.py is what fills it
+        self.cache = cache
+        # Token usage and latency (in seconds) of the most recent call
+        # These stay None until the first call completes
+        self.last_usage = None
+        self.last_latency = None
+        # True if the most recent generate() was answered from the cache
+        self.last_from_cache = False
+    
+    def complete(self, prompt: str, temperature: float = 0.0) -> str:
+        """
+        Send a prompt to the LLM and return the raw response text.
+        
+        Args:
+            prompt (str): The prompt to send to the LLM.
+            temperature (float): Controls randomness (0.0 = deterministic, default).
+        
+        Returns:
+            str: The unparsed response text.
+        
+        Also records token usage and latency in `last_usage` and `last_latency`.
+        """
+        # Time the API call so callers can track latency
+        start = time.perf_counter()
+        
+        # Send the prompt to OpenAI's API using the new syntax for chat completions
+        response = openai.chat.completions.create(
+            model=self.model,  # The model to use (e.g., gpt-3.5-turbo)
+            messages=[  # The conversation history (just one user message here)
+                {"role": "user", "content": prompt}
+            ],
+            temperature=temperature  # Control output randomness
+        )
+        
+        self.last_latency = time.perf_counter() - start
+        
+        # Record token usage if the API reported it
+        usage = getattr(response, "usage", None)
+        if usage is not None:
+            self.last_usage = {
+                "prompt_tokens": usage.prompt_tokens,
+                "completion_tokens": usage.completion_tokens,
+                "total_tokens": usage.total_tokens
+            }
+        else:
+            self.last_usage = None
+        
+        # Extract the response text from the first choice
+        return response.choices[0].message.content
+    
+    @staticmethod
+    def parse_response(response_text: str) -> list:
+        """
+        Parse the LLM response text as JSON.
+        
+        Args:
+            response_text (str): The raw response text from the LLM.
+        
+        Returns:
+            list: A list of dictionaries parsed from the JSON response.
+        
+        Raises:
+            ResponseParseError: If the text isn't valid JSON.
+        """
+        # Clean the JSON string to fix common issues like trailing commas
+        # Remove trailing commas in arrays (e.g., [item1, item2,] -> [item1, item2])
+        cleaned_text = re.sub(r',\s*]', ']', response_text)
+        
+        try:
+            # Parse the JSON string into a Python list of dictionaries
+            return json.loads(cleaned_text)
+        except json.JSONDecodeError as e:
+            # If JSON parsing fails, raise an error with the response text for debugging
+            raise ResponseParseError(f"Failed to parse LLM response as JSON: {str(e)}\nResponse text: {cleaned_text}")
     
-    def generate(self, prompt: str, temperature: float = 0.0) -> list:
+    def generate(self, prompt: str, temperature: float = 0.0, use_cache: bool = True) -> list:
         """
         Send a prompt to the LLM and return the parsed JSON response.
         
         Args:
             prompt (str): The prompt to send to the LLM.
             temperature (float): Controls randomness (0.0 = deterministic, default).
+            use_cache (bool): Set to False to skip pre-warmed results (e.g., when retrying).
         
         Returns:
             list: A list of dictionaries parsed from the JSON response.
         
         This method assumes the LLM returns JSON (e.g., [{"question": "...", "explanation": "..."}]).
+        If the agent has a cache and precompute.py has pre-warmed this exact prompt,
+        the pre-warmed result is returned without an API call.
         """
+        # Serve pre-warmed results (only precompute.py's entries carry a template hash)
+        self.last_from_cache = False
+        if self.cache is not None and use_cache:
+            entry = self.cache.get(prompt_key(self.model, prompt, temperature))
+            if entry is not None and entry.get("template_hash"):
+                # No API call was made, so there's no usage or latency to report
+                self.last_usage = None
+                self.last_latency = None
+                self.last_from_cache = True
+                return entry["result"]
+        
         try:
-            # Send the prompt to OpenAI's API using the new syntax for chat completions
-            response = openai.chat.completions.create(
-                model=self.model,  # The model to use (e.g., gpt-3.5-turbo)
-                messages=[  # The conversation history (just one user message here)
-                    {"role": "user", "content": prompt}
-                ],
-                temperature=temperature  # Control output randomness
-            )
-            
-            # Extract the response text from the first choice
-            response_text = response.choices[0].message.content
+            # Get the raw response text from the LLM
+            response_text = self.complete(prompt, temperature)
             
-            # Clean the JSON string to fix common issues like trailing commas
-            # Remove trailing commas in arrays (e.g., [item1, item2,] -> [item1, item2])
-            response_text = re.sub(r',\s*]', ']', response_text)
-            
-            # Parse the JSON string into a Python list of dictionaries
-            result = json.loads(response_text)
-            
-            # Return the parsed result
-            return result
+            # Parse it and return the result
+            return self.parse_response(response_text)
         
-        except json.JSONDecodeError as e:
-            # If JSON parsing fails, raise an error with the response text for debugging
-            raise Exception(f"Failed to parse LLM response as JSON: {str(e)}\nResponse text: {response_text}")
+        except ResponseParseError:
+            # Parsing errors already include the response text for debugging
+            raise
         except Exception as e:
             # If any other error occurs (e.g., API failure), raise it
             raise Exception(f"Error generating response: {str(e)}")
\ No newline at end of file
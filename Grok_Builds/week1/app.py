@@ -11,7 +11,7 @@ Date Created: May 10, 2025
 
 How to Run:
 -----------
-1. Install requirements: `pip install openai streamlit python-dotenv`
+1. Install requirements: `pip install openai streamlit python-dotenv tiktoken`
 2. Set your OpenAI API key in a `.env` file (for local use) or Streamlit secrets (for Streamlit Cloud).
 3. Run the app: `streamlit run app.py`
 """
@@ -22,7 +22,9 @@ import os  # For accessing environment variables and file paths
 from dotenv import load_dotenv  # For loading environment variables
 # Import local modules
 from agent import SimpleAgent  # The AI agent class
-from prompts import HEALTHCARE_QUALIFYING_QUESTIONS  # The prompt template
+from prompts import HEALTHCARE_QUALIFYING_QUESTIONS, PRECOMPUTE_CATALOG  # The prompt template and common situations
+from cache import ResponseCache  # Shared cache of generated responses (pre-warmed by precompute.py)
+from tokens import fit_input  # Input budgeting for long pasted text
 
 # Debug print to confirm the file version
 print("Loading app.py - Version: 2025-05-11 (c1d2e3f4-5a6b-4c7d-8e9f-0a1b2c3d4e5f)")
@@ -62,6 +64,15 @@ st.set_page_config(
 # Debug print to confirm set_page_config was called
 print("st.set_page_config() called successfully")
 
+@st.cache_resource
+def get_response_cache():
+    """
+    Load the shared response cache once per Streamlit server.
+    
+    The cache reloads itself when precompute.py writes new entries to the file.
+    """
+    return ResponseCache()
+
 def run_web_interface():
     """
     Run the Streamlit web interface for the qualifying questions generator.
@@ -96,11 +107,18 @@ def run_web_interface():
     st.title("Healthcare Sales Qualifying Questions Generator")
     st.write("Generate qualifying questions based on a client's situation or pain point.")
 
+    # Offer the common situations as quick picks (these are pre-warmed, so they're instant)
+    common_situation = st.selectbox(
+        "Start from a common situation (optional)",
+        [""] + PRECOMPUTE_CATALOG["HEALTHCARE_QUALIFYING_QUESTIONS"]
+    )
+
     # Create a text area for the user to enter the client situation
     user_goal = st.text_area(
         "Enter the client's situation or pain point",
+        value=common_situation,
         placeholder="e.g., Client is struggling with patient data management and compliance"
-    )
+    ).strip()
 
     # Add a number input for the user to specify the number of questions
     num_questions = st.number_input(
@@ -110,6 +128,9 @@ def run_web_interface():
         value=10  # Default to 10 questions
     )
 
+    # Let the user skip pre-warmed answers (e.g., to retry for a different set of questions)
+    fresh_answer = st.checkbox("Generate fresh questions (skip pre-warmed answers)")
+
     # Add a button to trigger question generation
     if st.button("Generate Questions"):
         # Check if the user provided input; if not, show a warning
@@ -120,26 +141,36 @@ def run_web_interface():
             with st.spinner("Generating your qualifying questions..."):
                 try:
                     # Create an instance of the SimpleAgent with the API key
-                    agent = SimpleAgent(api_key=OPENAI_API_KEY)
+                    # Common situations pre-warmed by precompute.py are served from the cache
+                    agent = SimpleAgent(api_key=OPENAI_API_KEY, cache=get_response_cache())
+                    
+                    # Trim long input (e.g., a pasted email thread) to the template's budget
+                    situation, budget_report = fit_input(user_goal, "HEALTHCARE_QUALIFYING_QUESTIONS", agent.model)
+                    if budget_report["trimmed"]:
+                        st.info(f"Your input was long, so only its most relevant part was used: {budget_report['original_tokens']} -> {budget_report['final_tokens']} tokens ({budget_report['saved_tokens']} saved).")
                     
                     # Format the prompt with the user’s input and number of questions
                     prompt = HEALTHCARE_QUALIFYING_QUESTIONS.format(
-                        input=user_goal,
+                        input=situation,
                         num=num_questions
                     )
                     
                     # Use the agent to generate questions
-                    questions = agent.generate(prompt)
+                    questions = agent.generate(prompt, use_cache=not fresh_answer)
                     
                     # Check if the correct number of questions was generated
                     if len(questions) != num_questions:
-                        st.warning(f"Requested {num_questions} questions, but only {len(questions)} were generated. Try again or adjust the prompt.")
+                        st.warning(f"Requested {num_questions} questions, but only {len(questions)} were generated. Try again (with 'Generate fresh questions' checked) or adjust the prompt.")
                     
                     # Check if questions were generated successfully
                     if questions:
                         # Display a success message with the number of questions
                         st.success(f"Here are your {len(questions)} qualifying questions:")
                         
+                        # Let the rep know this is a pre-warmed answer and how to get a new one
+                        if agent.last_from_cache:
+                            st.caption("These are pre-warmed questions for a common situation. Check 'Generate fresh questions' for a new set.")
+                        
                         # Loop through the questions and display each one
                         for i, item in enumerate(questions, 1):
                             # Use markdown for formatted text (bold question, italic explanation)
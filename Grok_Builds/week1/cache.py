@@ -0,0 +1,225 @@
+"""
+cache.py
+========
+A file-backed cache of pre-warmed LLM responses.
+
+precompute.py fills this cache with answers for the canonical situations in
+prompts.PRECOMPUTE_CATALOG. Entries are keyed by model, temperature, and the
+fully formatted prompt, so the app and CLI can answer those exact requests
+instantly. Only the precompute job writes to the cache; what users type is
+never stored.
+
+The cache lives in a JSON file. The file on disk is always the source of truth,
+and every change is a read-modify-write done under a cross-process file lock,
+so the app, the CLI, and the precompute job never overwrite each other's work.
+
+Author: Bradley Pierce
+Date Created: October 19, 2026
+"""
+
+# Import standard libraries
+import hashlib  # For fingerprinting prompt templates
+import json  # For reading and writing the cache file
+import os  # For file paths and atomic file replacement
+import threading  # For keeping the cache safe across threads
+import time  # For entry timestamps
+from contextlib import contextmanager  # For the file lock helper
+
+try:
+    import fcntl  # Cross-process file locking (macOS and Linux)
+except ImportError:
+    fcntl = None  # Not available on Windows; the thread lock still applies
+
+# Default cache file location (next to this script)
+script_dir = os.path.dirname(os.path.abspath(__file__))  # Absolute path to week1
+DEFAULT_CACHE_PATH = os.path.join(script_dir, "response_cache.json")
+
+# Entries older than this are ignored and removed (precompute.py refreshes sooner)
+# Set RESPONSE_CACHE_MAX_AGE_HOURS in the root .env file to change it; the app, CLI,
+# and precompute.py all read the same setting, so they agree on when entries expire
+DEFAULT_MAX_AGE_HOURS = 24
+
+# The most entries the cache keeps; the oldest are removed first
+DEFAULT_MAX_ENTRIES = 500
+
+def template_hash(template: str) -> str:
+    """
+    Fingerprint a prompt template's content.
+
+    Args:
+        template (str): The template string from prompts.py.
+
+    Returns:
+        str: A short SHA-256 hex digest that changes whenever the template is edited.
+    """
+    return hashlib.sha256(template.encode("utf-8")).hexdigest()[:16]
+
+def configured_max_age_hours() -> float:
+    """
+    Return the cache max age from RESPONSE_CACHE_MAX_AGE_HOURS (or the default).
+
+    Raises:
+        ValueError: If the setting isn't a positive number.
+    """
+    value = os.getenv("RESPONSE_CACHE_MAX_AGE_HOURS")
+    if not value:
+        return DEFAULT_MAX_AGE_HOURS
+    try:
+        hours = float(value)
+    except ValueError:
+        hours = 0
+    if hours <= 0:
+        raise ValueError(f"RESPONSE_CACHE_MAX_AGE_HOURS must be a positive number of hours, got {value!r}")
+    return hours
+
+class ResponseCache:
+    """
+    A JSON file of pre-warmed LLM responses, shared between processes.
+
+    Each entry holds the parsed result, when it was created, and which template
+    (and template hash) produced it.
+    """
+
+    def __init__(self, path: str = DEFAULT_CACHE_PATH, max_age_hours: float = None,
+                 max_entries: int = DEFAULT_MAX_ENTRIES):
+        """
+        Load the cache from disk (an empty cache is used if the file doesn't exist).
+
+        Args:
+            path (str): Path to the JSON cache file.
+            max_age_hours (float): Entries older than this are ignored and removed
+                (default: RESPONSE_CACHE_MAX_AGE_HOURS from the environment, or 24).
+            max_entries (int): The most entries to keep.
+        """
+        self.path = path
+        if max_age_hours is None:
+            max_age_hours = configured_max_age_hours()
+        self.max_age_hours = max_age_hours
+        self.max_age = max_age_hours * 3600
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._entries = {}
+        self._signature = None
+        with self._lock:
+            self._reload_if_changed()
+
+    @contextmanager
+    def _file_lock(self):
+        """Hold an exclusive lock (shared with other processes) for a read-modify-write."""
+        with self._lock:
+            if fcntl is None:
+                yield
+                return
+            with open(f"{self.path}.lock", "w") as lock_file:
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+                try:
+                    yield
+                finally:
+                    fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def _reload_if_changed(self):
+        """Replace the in-memory copy with the file on disk if the file has changed."""
+        try:
+            # Every save replaces the file, so the inode changes even within one mtime tick
+            stat = os.stat(self.path)
+            signature = (stat.st_ino, stat.st_mtime_ns)
+        except OSError:
+            # No file (yet, or it was deleted), so the cache is empty
+            self._entries = {}
+            self._signature = None
+            return
+        if signature == self._signature:
+            return
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                self._entries = json.load(f)
+        except (OSError, ValueError):
+            # An unreadable file shouldn't break generation; treat it as empty
+            self._entries = {}
+        self._signature = signature
+
+    def _is_expired(self, entry: dict) -> bool:
+        """Return True if an entry is older than the cache's max age."""
+        return time.time() - entry.get("created_at", 0) > self.max_age
+
+    def get(self, key: str):
+        """
+        Return the cached entry for a key, or None if it's missing or expired.
+
+        Args:
+            key (str): The request key (see agent.prompt_key).
+
+        Returns:
+            dict: The entry (with "result", "created_at", "template", ...), or None.
+        """
+        with self._lock:
+            self._reload_if_changed()
+            entry = self._entries.get(key)
+        if entry is None or self._is_expired(entry):
+            return None
+        return entry
+
+    def put(self, key: str, result: list, template: str, template_hash: str, **metadata):
+        """
+        Store a pre-warmed result and write the cache to disk.
+
+        Args:
+            key (str): The request key (see agent.prompt_key).
+            result (list): The parsed LLM response.
+            template (str): The name of the template in prompts.py that produced it.
+            template_hash (str): template_hash() of that template.
+            **metadata: Extra fields to keep with the entry (e.g., model, num, usage).
+        """
+        entry = {"result": result, "created_at": time.time(), "template": template, "template_hash": template_hash}
+        entry.update(metadata)
+        with self._file_lock():
+            self._signature = None  # Always start from the current file
+            self._reload_if_changed()
+            self._entries[key] = entry
+            self._save()
+
+    def prune(self, current_hashes: dict) -> int:
+        """
+        Remove expired entries and entries that don't come from a current catalog template.
+
+        Args:
+            current_hashes (dict): Template name -> current template_hash().
+
+        Returns:
+            int: The number of entries removed.
+        """
+        with self._file_lock():
+            self._signature = None  # Always start from the current file
+            self._reload_if_changed()
+            before = len(self._entries)
+            self._entries = {
+                key: entry for key, entry in self._entries.items()
+                if current_hashes.get(entry.get("template")) == entry.get("template_hash")
+            }
+            # Saving also drops expired entries
+            self._save()
+            return before - len(self._entries)
+
+    def __len__(self):
+        with self._lock:
+            self._reload_if_changed()
+            return len(self._entries)
+
+    def _save(self):
+        """
+        Drop expired entries, cap the size, and write the cache to disk.
+
+        The caller must hold the file lock.
+        """
+        live = [(key, entry) for key, entry in self._entries.items() if not self._is_expired(entry)]
+        # Keep only the newest entries if there are too many
+        live.sort(key=lambda item: item[1].get("created_at", 0), reverse=True)
+        self._entries = dict(live[:self.max_entries])
+
+        # Write to a temporary file first so readers never see a half-written cache
+        temp_path = f"{self.path}.tmp"
+        with open(temp_path, "w", encoding="utf-8") as f:
+            json.dump(self._entries, f)
+        os.replace(temp_path, self.path)
+        stat = os.stat(self.path)
+        self._signature = (stat.st_ino, stat.st_mtime_ns)
@@ -14,6 +14,7 @@ How to Run:
 1. Ensure you're in the GROK_AI_AGENT/Grok_Builds/week1 directory.
 2. Run: python cli.py "Your client situation here"
    Example: python cli.py "Client is struggling with patient data"
+3. Add --fresh to skip pre-warmed answers: python cli.py --fresh "Your client situation here"
 """
 # Import standard libraries
 import sys  # For accessing command-line arguments
@@ -21,6 +22,8 @@ import os  # For accessing environment variables and file paths
 # Import local modules
 from agent import SimpleAgent  # The AI agent class
 from prompts import HEALTHCARE_QUALIFYING_QUESTIONS  # The prompt template
+from tokens import fit_input  # Input budgeting for long pasted text
+from cache import ResponseCache  # Shared cache of generated responses (pre-warmed by precompute.py)
 from dotenv import load_dotenv  # For loading the .env file
 
 # Load the .env file from the root directory (Grok_AI_Agents)
@@ -57,39 +60,54 @@ def run_cli():
     This function takes the client situation as a command-line argument,
     generates questions, and prints them to the terminal.
     """
+    # Separate the optional --fresh flag (skip pre-warmed answers) from the situation
+    args = sys.argv[1:]
+    fresh_answer = "--fresh" in args
+    args = [arg for arg in args if arg != "--fresh"]
+    
     # Check if a client situation was provided as a command-line argument
-    if len(sys.argv) < 2:
-        print("Usage: python cli.py \"Your client situation here\"")
+    if not args:
+        print("Usage: python cli.py [--fresh] \"Your client situation here\"")
         print("Example: python cli.py \"Client is struggling with patient data\"")
         sys.exit(1)
     
     # Get the client situation from the command-line argument
-    user_goal = sys.argv[1]
+    user_goal = args[0].strip()
     
     # Set the number of questions to generate
     num_questions = 5
     
     try:
         # Create an instance of the SimpleAgent with the API key
-        agent = SimpleAgent(api_key=OPENAI_API_KEY)
+        # Common situations pre-warmed by precompute.py are served from the cache
+        agent = SimpleAgent(api_key=OPENAI_API_KEY, cache=ResponseCache())
+        
+        # Trim long input (e.g., a pasted email thread) to the template's budget
+        situation, budget_report = fit_input(user_goal, "HEALTHCARE_QUALIFYING_QUESTIONS", agent.model)
+        if budget_report["trimmed"]:
+            print(f"Note: Input trimmed from {budget_report['original_tokens']} to {budget_report['final_tokens']} tokens ({budget_report['saved_tokens']} saved).")
         
         # Format the prompt with the user’s input and number of questions
         prompt = HEALTHCARE_QUALIFYING_QUESTIONS.format(
-            input=user_goal,
+            input=situation,
             num=num_questions
         )
         
         # Generate the questions using the agent
-        questions = agent.generate(prompt)
+        questions = agent.generate(prompt, use_cache=not fresh_answer)
         
         # Check if the correct number of questions was generated
         if len(questions) != num_questions:
             print(f"Warning: Requested {num_questions} questions, but only {len(questions)} were generated.")
-            print("The LLM may not have followed the prompt exactly. You can try running the command again.")
+            print("The LLM may not have followed the prompt exactly. You can try running the command again with --fresh.")
             # Optionally, you could add a retry mechanism here, but for simplicity, we'll just proceed
         
         # Print the generated questions
         print(f"\nGenerated {len(questions)} Qualifying Questions for: {user_goal}\n")
+        
+        # Let the user know this is a pre-warmed answer and how to get a new one
+        if agent.last_from_cache:
+            print("(Pre-warmed questions for a common situation. Run again with --fresh for a new set.)\n")
         for i, item in enumerate(questions, 1):
             print(f"Question {i}: {item['question']}")
             print(f"Explanation: {item['explanation']}")
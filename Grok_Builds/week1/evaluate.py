@@ -0,0 +1,329 @@
+"""
+evaluate.py
+===========
+An evaluation harness for comparing prompt templates and models.
+
+This script runs every combination of template and model over a fixed dataset of
+client situations, in parallel, through SimpleAgent. For each combination it reports:
+- Latency distribution (p50, p95, max)
+- Token usage per call
+- JSON parse-failure rate
+- Count compliance (the share of responses that return exactly `num` items)
+
+Responses come from a recorded-response replay store, so runs are deterministic
+and work offline. Use record mode once to fill the store from the live API.
+
+Author: Bradley Pierce
+Date Created: October 19, 2026
+
+How to Run:
+-----------
+1. Record responses (needs OPENAI_API_KEY in the root .env file):
+   python evaluate.py --mode record --templates HEALTHCARE_QUALIFYING_QUESTIONS --models gpt-3.5-turbo
+2. Replay them offline and compare (the run stops with an error if any case
+   hasn't been recorded yet):
+   python evaluate.py --templates HEALTHCARE_QUALIFYING_QUESTIONS --models gpt-3.5-turbo
+"""
+# Import standard libraries
+import argparse  # For parsing command-line options
+import json  # For loading the dataset and writing the report
+import math  # For percentile calculations
+import os  # For accessing environment variables and file paths
+import sys  # For exiting with an error code
+from concurrent.futures import ThreadPoolExecutor  # For running cases in parallel
+# Import local modules
+import prompts  # The prompt templates to evaluate
+from agent import ResponseParseError, prompt_key  # JSON parse error and request key helper
+from replay import ReplayAgent, ReplayStore  # Recorded-response replay
+from tokens import fit_input  # The same input budgeting the app applies
+
+# Default file locations (next to this script)
+script_dir = os.path.dirname(os.path.abspath(__file__))  # Absolute path to week1
+DEFAULT_DATASET_PATH = os.path.join(script_dir, "eval_situations.json")
+DEFAULT_STORE_PATH = os.path.join(script_dir, "eval_recordings.json")
+
+def load_dataset(path: str) -> list:
+    """
+    Load the evaluation dataset.
+
+    Args:
+        path (str): Path to a JSON list of {"input": "...", "num": 5} objects.
+
+    Returns:
+        list: The dataset cases.
+    """
+    with open(path, "r", encoding="utf-8") as f:
+        cases = json.load(f)
+
+    # Make sure there's something to evaluate and every case has what the templates need
+    if not isinstance(cases, list) or not cases:
+        raise ValueError(f"Dataset {path} must be a non-empty JSON list of cases")
+    for i, case in enumerate(cases):
+        if "input" not in case or "num" not in case:
+            raise ValueError(f"Dataset case {i} must have 'input' and 'num' fields")
+    return cases
+
+def get_template(name: str) -> str:
+    """
+    Look up a prompt template in prompts.py by its variable name.
+
+    Args:
+        name (str): The template name (e.g., HEALTHCARE_QUALIFYING_QUESTIONS).
+
+    Returns:
+        str: The template string.
+    """
+    template = getattr(prompts, name, None)
+    if not isinstance(template, str):
+        raise ValueError(f"No prompt template named {name} in prompts.py")
+    return template
+
+def build_case_prompt(template_name: str, model: str, case: dict) -> str:
+    """
+    Build the prompt for one dataset case, applying the same input budget as the app.
+
+    Args:
+        template_name (str): The prompt template to use.
+        model (str): The LLM model (used for input budgeting).
+        case (dict): The dataset case ({"input": ..., "num": ...}).
+
+    Returns:
+        str: The formatted prompt.
+    """
+    situation, _ = fit_input(case["input"], template_name, model)
+    return get_template(template_name).format(input=situation, num=case["num"])
+
+def find_missing_recordings(cases: list, template_names: list, models: list, store: ReplayStore) -> list:
+    """
+    List the (template, model, input) combinations that have no recorded response.
+
+    Returns:
+        list: One tuple per missing recording (empty if everything can be replayed).
+    """
+    return [
+        (template_name, model, case["input"])
+        for template_name in template_names
+        for model in models
+        for case in cases
+        if store.get(prompt_key(model, build_case_prompt(template_name, model, case))) is None
+    ]
+
+def run_case(template_name: str, model: str, case: dict, store: ReplayStore, api_key: str = None, mode: str = "replay") -> dict:
+    """
+    Run one dataset case for one template and model.
+
+    Args:
+        template_name (str): The prompt template to use.
+        model (str): The LLM model to use.
+        case (dict): The dataset case ({"input": ..., "num": ...}).
+        store (ReplayStore): The recorded-response store.
+        api_key (str): OpenAI API key (only needed in record mode).
+        mode (str): "replay" or "record".
+
+    Returns:
+        dict: The outcome, latency, and token usage of this run.
+    """
+    # Each run gets its own agent so usage and latency aren't shared between threads
+    agent = ReplayAgent(api_key=api_key, store=store, model=model, mode=mode)
+    prompt = build_case_prompt(template_name, model, case)
+
+    record = {
+        "template": template_name,
+        "model": model,
+        "input": case["input"],
+        "num": case["num"],
+        "status": "ok",
+        "count": None,
+        "latency": None,
+        "usage": None
+    }
+
+    try:
+        items = agent.generate(prompt)
+        record["count"] = len(items) if isinstance(items, list) else None
+    except ResponseParseError:
+        record["status"] = "parse_error"
+    except Exception as e:
+        record["status"] = "error"
+        record["error"] = str(e)
+
+    record["latency"] = agent.last_latency
+    record["usage"] = agent.last_usage
+    return record
+
+def run_eval(cases: list, template_names: list, models: list, store: ReplayStore, api_key: str = None, mode: str = "replay", max_workers: int = 8) -> list:
+    """
+    Run every dataset case for every template and model combination in parallel.
+
+    Returns:
+        list: One record per (template, model, case), in a stable order.
+    """
+    jobs = [
+        (template_name, model, case)
+        for template_name in template_names
+        for model in models
+        for case in cases
+    ]
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = [
+            executor.submit(run_case, template_name, model, case, store, api_key, mode)
+            for template_name, model, case in jobs
+        ]
+        # Collect results in submission order so reports are deterministic
+        return [future.result() for future in futures]
+
+def percentile(values: list, pct: float):
+    """Return the nearest-rank percentile of a list of numbers (None if empty)."""
+    if not values:
+        return None
+    ordered = sorted(values)
+    rank = max(1, math.ceil(pct / 100 * len(ordered)))
+    return ordered[rank - 1]
+
+def summarize(records: list) -> list:
+    """
+    Aggregate run records into one summary row per (template, model).
+
+    Rows are ranked by count compliance (highest first), then by error rate (lowest first),
+    then by p50 latency (lowest first), so combinations that mostly failed sort last.
+    """
+    groups = {}
+    for record in records:
+        groups.setdefault((record["template"], record["model"]), []).append(record)
+
+    rows = []
+    for (template_name, model), group in groups.items():
+        runs = len(group)
+        latencies = [r["latency"] for r in group if r["latency"] is not None]
+        usages = [r["usage"] for r in group if r["usage"]]
+        parse_errors = sum(1 for r in group if r["status"] == "parse_error")
+        errors = sum(1 for r in group if r["status"] == "error")
+        compliant = sum(1 for r in group if r["status"] == "ok" and r["count"] == r["num"])
+
+        rows.append({
+            "template": template_name,
+            "model": model,
+            "runs": runs,
+            "latency_p50": percentile(latencies, 50),
+            "latency_p95": percentile(latencies, 95),
+            "latency_max": max(latencies) if latencies else None,
+            "avg_prompt_tokens": sum(u["prompt_tokens"] for u in usages) / len(usages) if usages else None,
+            "avg_completion_tokens": sum(u["completion_tokens"] for u in usages) / len(usages) if usages else None,
+            "total_tokens": sum(u["total_tokens"] for u in usages),
+            "parse_failure_rate": parse_errors / runs,
+            "error_rate": errors / runs,
+            "count_compliance": compliant / runs
+        })
+
+    rows.sort(key=lambda row: (-row["count_compliance"], row["error_rate"], row["latency_p50"] if row["latency_p50"] is not None else math.inf))
+    return rows
+
+def format_report(rows: list) -> str:
+    """Format summary rows as a plain-text comparison table."""
+    def fmt(value, pattern):
+        return "-" if value is None else pattern.format(value)
+
+    header = f"{'Template':<36} {'Model':<16} {'Runs':>4} {'p50 s':>7} {'p95 s':>7} {'Max s':>7} {'In tok':>7} {'Out tok':>7} {'Parse fail':>10} {'Errors':>7} {'Count ok':>8}"
+    lines = [header, "-" * len(header)]
+    for row in rows:
+        lines.append(
+            f"{row['template']:<36} {row['model']:<16} {row['runs']:>4} "
+            f"{fmt(row['latency_p50'], '{:.2f}'):>7} {fmt(row['latency_p95'], '{:.2f}'):>7} {fmt(row['latency_max'], '{:.2f}'):>7} "
+            f"{fmt(row['avg_prompt_tokens'], '{:.0f}'):>7} {fmt(row['avg_completion_tokens'], '{:.0f}'):>7} "
+            f"{row['parse_failure_rate']:>10.0%} {row['error_rate']:>7.0%} {row['count_compliance']:>8.0%}"
+        )
+    return "\n".join(lines)
+
+def load_api_key() -> str:
+    """Load OPENAI_API_KEY from the root .env file (same location as cli.py uses)."""
+    from dotenv import load_dotenv  # Only needed when recording
+
+    # week1 -> Grok_Builds -> Grok_AI_Agents
+    root_dir = os.path.dirname(os.path.dirname(script_dir))
+    dotenv_path = os.path.join(root_dir, '.env')
+    if os.path.exists(dotenv_path):
+        load_dotenv(dotenv_path)
+    return os.getenv("OPENAI_API_KEY")
+
+def positive_int(value: str) -> int:
+    """Parse a command-line value as an integer of at least 1."""
+    number = int(value)
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"must be at least 1, got {value}")
+    return number
+
+def main():
+    """
+    Parse command-line options, run the evaluation, and print the comparison report.
+    """
+    parser = argparse.ArgumentParser(description="Compare prompt templates and models on a fixed dataset.")
+    parser.add_argument("--templates", nargs="+", default=["HEALTHCARE_QUALIFYING_QUESTIONS"], help="Template names from prompts.py")
+    parser.add_argument("--models", nargs="+", default=["gpt-3.5-turbo"], help="Model names to compare")
+    parser.add_argument("--dataset", default=DEFAULT_DATASET_PATH, help="JSON file of {input, num} cases")
+    parser.add_argument("--store", default=DEFAULT_STORE_PATH, help="Recorded-response store file")
+    parser.add_argument("--mode", choices=["replay", "record"], default="replay", help="replay = offline only; record = fetch missing responses")
+    parser.add_argument("--workers", type=positive_int, default=8, help="Number of parallel requests")
+    parser.add_argument("--output", help="Optional path to write the summary and per-run records as JSON")
+    args = parser.parse_args()
+
+    try:
+        cases = load_dataset(args.dataset)
+        for name in args.templates:
+            get_template(name)
+    except (OSError, ValueError) as e:
+        print(f"Error: {str(e)}")
+        sys.exit(1)
+
+    api_key = None
+    if args.mode == "record":
+        api_key = load_api_key()
+        if not api_key:
+            print("Error: OPENAI_API_KEY not found. It's required in record mode.")
+            sys.exit(1)
+
+    store = ReplayStore(args.store)
+
+    # Replay mode never calls the API, so every case needs a recording
+    if args.mode == "replay":
+        if not os.path.exists(args.store):
+            print(f"Error: No recorded-response store at {args.store}.")
+            print("Run with --mode record first to record responses from the API.")
+            sys.exit(1)
+        missing = find_missing_recordings(cases, args.templates, args.models, store)
+        if missing:
+            print(f"Error: {len(missing)} of {len(cases) * len(args.templates) * len(args.models)} cases have no recorded response in {args.store}, e.g.:")
+            for template_name, model, situation in missing[:5]:
+                print(f"  {template_name} / {model} / {situation!r}")
+            print("Run with --mode record (same templates and models) to record them.")
+            sys.exit(1)
+
+    records = run_eval(cases, args.templates, args.models, store, api_key=api_key, mode=args.mode, max_workers=args.workers)
+
+    # Save any newly recorded responses
+    if args.mode == "record":
+        store.save()
+
+    # A table made only of errors isn't a comparison, so show the errors instead
+    failed = [r for r in records if r["status"] == "error"]
+    if records and len(failed) == len(records):
+        print("Error: Every run failed, so there's nothing to compare. First error:")
+        print(f"  {failed[0]['error']}")
+        sys.exit(1)
+
+    rows = summarize(records)
+    print(f"\nEvaluated {len(cases)} situations x {len(args.templates)} templates x {len(args.models)} models ({args.mode} mode)\n")
+    print(format_report(rows))
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump({"summary": rows, "runs": records}, f, indent=2)
+        print(f"\nFull results written to {args.output}")
+
+if __name__ == "__main__":
+    """
+    Entry point of the script.
+
+    This block runs when the script is executed directly (e.g., `python evaluate.py`).
+    """
+    main()
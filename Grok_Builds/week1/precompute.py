@@ -0,0 +1,283 @@
+"""
+precompute.py
+=============
+Pre-warms the response cache with answers for common client situations.
+
+Reps ask about a predictable set of scenarios (compliance, data management,
+staffing, ...). This job generates answers for the canonical situations in
+prompts.PRECOMPUTE_CATALOG ahead of time and loads them into the shared response
+cache (cache.py), so those requests are served instantly in the app and CLI.
+
+Each pass only generates entries that are missing or older than the refresh age.
+The refresh age must be shorter than the cache's max age (RESPONSE_CACHE_MAX_AGE_HOURS
+in the root .env, 24 hours by default), otherwise entries would expire before
+they're refreshed; by default it's half the max age.
+The prompt text is part of each entry's key, so editing a template (or its input
+budget) makes its entries missing, and they're regenerated. Entries from the old
+template are removed using a hash of the template's content. Results that don't
+have exactly the requested number of items are never cached. Passes stop once a
+token budget is spent, and the job runs at low CPU priority with a pause between
+requests so it doesn't compete with live traffic.
+
+Author: Bradley Pierce
+Date Created: October 19, 2026
+
+How to Run:
+-----------
+1. Once, before working hours (e.g., from cron: `0 6 * * 1-5 python precompute.py`):
+   python precompute.py
+2. Or keep it running and re-check every 30 minutes (picks up template edits):
+   python precompute.py --watch 30
+   If prompts.py can't be re-read (e.g., it's half-saved), the previous version is
+   kept and the next pass tries again.
+"""
+# Import standard libraries
+import argparse  # For parsing command-line options
+import importlib  # For re-reading prompts.py between passes
+import os  # For accessing environment variables and file paths
+import sys  # For exiting with an error code
+import time  # For pausing between requests and passes
+# Import local modules
+import prompts  # The prompt templates and the catalog of common situations
+from agent import SimpleAgent, prompt_key  # The AI agent class and request key helper
+from cache import DEFAULT_CACHE_PATH, ResponseCache, template_hash  # The shared response cache
+from tokens import count_tokens, fit_input  # Token estimates and input budgeting
+from dotenv import load_dotenv  # For loading the .env file
+
+# Question counts to precompute for each situation
+# These match the defaults in app.py (10) and cli.py (5)
+DEFAULT_NUMS = [5, 10]
+
+# Rough number of completion tokens per generated item, used to estimate cost up front
+EST_TOKENS_PER_ITEM = 60
+
+def build_prompt(template_name: str, situation: str, num: int, model: str) -> str:
+    """
+    Build a prompt exactly the way the app and CLI do, so the cache keys match.
+
+    Args:
+        template_name (str): The template's variable name in prompts.py.
+        situation (str): The client situation.
+        num (int): The number of items to generate.
+        model (str): The LLM model (used for input budgeting).
+
+    Returns:
+        str: The formatted prompt.
+    """
+    situation, _ = fit_input(situation, template_name, model)
+    return getattr(prompts, template_name).format(input=situation, num=num)
+
+def get_template(name: str):
+    """Return the template string named in prompts.py, or None if there isn't one."""
+    template = getattr(prompts, name, None)
+    return template if isinstance(template, str) else None
+
+def reload_prompts() -> bool:
+    """
+    Re-read prompts.py to pick up template and catalog edits.
+
+    If the file can't be loaded (e.g., it's half-saved), the previous version is
+    kept so the job keeps running.
+
+    Returns:
+        bool: True if the reload worked.
+    """
+    previous = dict(prompts.__dict__)
+    try:
+        importlib.reload(prompts)
+        return True
+    except Exception as e:
+        # reload() may have partly updated the module, so put the old contents back
+        prompts.__dict__.clear()
+        prompts.__dict__.update(previous)
+        print(f"Couldn't reload prompts.py ({type(e).__name__}: {str(e)}); keeping the previous version.")
+        return False
+
+def precompute(agent: SimpleAgent, cache: ResponseCache, catalog: dict = None, nums: list = DEFAULT_NUMS,
+               token_budget: int = 50000, refresh_hours: float = None, pause: float = 1.0) -> dict:
+    """
+    Run one precompute pass: generate missing or stale catalog entries into the cache.
+
+    Args:
+        agent (SimpleAgent): The agent used to call the LLM (its own cache is skipped).
+        cache (ResponseCache): The cache to load results into.
+        catalog (dict): Template name -> list of situations (default: prompts.PRECOMPUTE_CATALOG).
+        nums (list): The question counts to generate for each situation.
+        token_budget (int): Stop the pass once this many tokens have been used.
+        refresh_hours (float): Regenerate entries older than this (default: half the cache's max age).
+        pause (float): Seconds to wait between API calls.
+
+    Returns:
+        dict: Counts of generated, fresh (skipped), and failed (including wrong item count) entries, pruned entries,
+            tokens used, and whether the budget ran out.
+
+    Raises:
+        ValueError: If refresh_hours isn't shorter than the cache's max age.
+    """
+    if catalog is None:
+        catalog = prompts.PRECOMPUTE_CATALOG
+    if refresh_hours is None:
+        refresh_hours = cache.max_age_hours / 2
+    if refresh_hours >= cache.max_age_hours:
+        raise ValueError(
+            f"The refresh age ({refresh_hours}h) must be shorter than the cache's max age ({cache.max_age_hours}h); "
+            "raise RESPONSE_CACHE_MAX_AGE_HOURS in .env to keep entries longer"
+        )
+
+    # Fingerprint every catalog template so entries from edited or removed templates are pruned
+    # A catalog name with no matching template is skipped (and its old entries pruned)
+    current_hashes = {}
+    for name in set(prompts.PRECOMPUTE_CATALOG) | set(catalog):
+        template = get_template(name)
+        if template is None:
+            print(f"Skipping {name}: it's listed in the catalog but isn't a template in prompts.py.")
+        else:
+            current_hashes[name] = template_hash(template)
+
+    stats = {
+        "generated": 0,
+        "fresh": 0,
+        "failed": 0,
+        "pruned": cache.prune(current_hashes),
+        "tokens_used": 0,
+        "budget_exhausted": False
+    }
+
+    for template_name, situations in catalog.items():
+        if template_name not in current_hashes:
+            continue
+        for situation in situations:
+            for num in nums:
+                prompt = build_prompt(template_name, situation, num, agent.model)
+                key = prompt_key(agent.model, prompt)
+
+                # Skip recent entries (the key already covers the template and input text)
+                entry = cache.get(key)
+                if entry is not None and time.time() - entry["created_at"] < refresh_hours * 3600:
+                    stats["fresh"] += 1
+                    continue
+
+                # Estimate the cost first so a pass never overshoots the budget by much
+                estimate = count_tokens(prompt, agent.model) + num * EST_TOKENS_PER_ITEM
+                if stats["tokens_used"] + estimate > token_budget:
+                    stats["budget_exhausted"] = True
+                    return stats
+
+                try:
+                    result = agent.generate(prompt, use_cache=False)
+                except Exception as e:
+                    print(f"Failed to precompute {template_name} / {situation!r} ({num}): {str(e)}")
+                    stats["failed"] += 1
+                    # The call may still have used tokens, so count the estimate
+                    stats["tokens_used"] += estimate
+                    continue
+
+                stats["tokens_used"] += agent.last_usage["total_tokens"] if agent.last_usage else estimate
+
+                # Only cache answers that follow the prompt; a wrong count would be served all day
+                if not isinstance(result, list) or len(result) != num:
+                    count = len(result) if isinstance(result, list) else "no"
+                    print(f"Not caching {template_name} / {situation!r}: requested {num} items, got {count}")
+                    stats["failed"] += 1
+                else:
+                    cache.put(
+                        key,
+                        result,
+                        template=template_name,
+                        template_hash=current_hashes[template_name],
+                        model=agent.model,
+                        num=num,
+                        usage=agent.last_usage
+                    )
+                    stats["generated"] += 1
+
+                # Give interactive requests room before the next call
+                time.sleep(pause)
+
+    return stats
+
+def lower_priority():
+    """Lower this process's CPU priority so the app stays responsive (no-op where unsupported)."""
+    if hasattr(os, "nice"):
+        try:
+            os.nice(10)
+        except OSError:
+            pass
+
+def main():
+    """
+    Parse command-line options and run one precompute pass (or keep running with --watch).
+    """
+    parser = argparse.ArgumentParser(description="Pre-warm the response cache with common situations.")
+    parser.add_argument("--model", default="gpt-3.5-turbo", help="Model to precompute for (must match the app's model)")
+    parser.add_argument("--nums", nargs="+", type=int, default=DEFAULT_NUMS, help="Question counts to precompute")
+    parser.add_argument("--token-budget", type=int, default=50000, help="Maximum tokens to spend per pass")
+    parser.add_argument("--refresh-hours", type=float, help="Regenerate entries older than this (default: half of RESPONSE_CACHE_MAX_AGE_HOURS)")
+    parser.add_argument("--pause", type=float, default=1.0, help="Seconds to wait between API calls")
+    parser.add_argument("--cache", default=DEFAULT_CACHE_PATH, help="Response cache file")
+    parser.add_argument("--watch", type=float, metavar="MINUTES", help="Keep running and start a new pass every MINUTES")
+    args = parser.parse_args()
+
+    # Load the .env file from the root directory (Grok_AI_Agents)
+    # week1 -> Grok_Builds -> Grok_AI_Agents
+    script_dir = os.path.dirname(os.path.abspath(__file__))
+    root_dir = os.path.dirname(os.path.dirname(script_dir))
+    dotenv_path = os.path.join(root_dir, '.env')
+    if os.path.exists(dotenv_path):
+        load_dotenv(dotenv_path)
+
+    api_key = os.getenv("OPENAI_API_KEY")
+    if not api_key:
+        print("Error: OPENAI_API_KEY not found in .env file.")
+        sys.exit(1)
+
+    try:
+        # The cache reads RESPONSE_CACHE_MAX_AGE_HOURS, the same setting the app and CLI use
+        cache = ResponseCache(args.cache)
+        refresh_hours = args.refresh_hours if args.refresh_hours is not None else cache.max_age_hours / 2
+        if refresh_hours >= cache.max_age_hours:
+            raise ValueError(
+                f"--refresh-hours ({refresh_hours}) must be shorter than the cache's max age ({cache.max_age_hours}h); "
+                "raise RESPONSE_CACHE_MAX_AGE_HOURS in .env to keep entries longer"
+            )
+    except ValueError as e:
+        print(f"Error: {str(e)}")
+        sys.exit(1)
+
+    lower_priority()
+    agent = SimpleAgent(api_key=api_key, model=args.model)
+
+    while True:
+        try:
+            stats = precompute(
+                agent,
+                cache,
+                nums=args.nums,
+                token_budget=args.token_budget,
+                refresh_hours=refresh_hours,
+                pause=args.pause
+            )
+            print(
+                f"Precompute pass: {stats['generated']} generated, {stats['fresh']} already fresh, "
+                f"{stats['failed']} failed, {stats['pruned']} stale removed, {stats['tokens_used']} tokens used"
+                + (" (token budget reached)" if stats["budget_exhausted"] else "")
+            )
+        except Exception as e:
+            # Without --watch a failed pass is an error; with it, log and try again next pass
+            if args.watch is None:
+                raise
+            print(f"Precompute pass failed ({type(e).__name__}: {str(e)}); retrying next pass.")
+
+        if args.watch is None:
+            break
+        time.sleep(args.watch * 60)
+        # Pick up template and catalog edits made since the last pass
+        reload_prompts()
+
+if __name__ == "__main__":
+    """
+    Entry point of the script.
+
+    This block runs when the script is executed directly (e.g., `python precompute.py`).
+    """
+    main()
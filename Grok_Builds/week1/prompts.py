@@ -40,4 +40,32 @@ Return the response in JSON format, like this:
     {{"question": "Can you describe the issue in detail?", "explanation": "This helps gather more context."}},
     ...
 ]
-"""
\ No newline at end of file
+"""
+
+# Maximum number of tokens of user input ({input}) each template accepts
+# Longer input (e.g., a pasted email thread) is trimmed to its most relevant part
+# before formatting, which keeps latency and cost bounded (see tokens.py)
+INPUT_TOKEN_BUDGETS = {
+    "HEALTHCARE_QUALIFYING_QUESTIONS": 800,
+    "CUSTOMER_SUPPORT_QUESTIONS": 800
+}
+
+# Budget used for templates that aren't listed above
+DEFAULT_INPUT_TOKEN_BUDGET = 800
+
+# Canonical situations that reps ask about often, listed per template
+# precompute.py generates these ahead of time and loads them into the response cache,
+# and app.py offers them as quick picks so they're served instantly
+PRECOMPUTE_CATALOG = {
+    "HEALTHCARE_QUALIFYING_QUESTIONS": [
+        "Client is struggling with patient data management and compliance",
+        "Client is preparing for a HIPAA compliance audit",
+        "Client has high staff turnover and relies on agency staffing",
+        "Client is consolidating multiple EHR systems after a merger",
+        "Client has a growing backlog of denied insurance claims"
+    ],
+    "CUSTOMER_SUPPORT_QUESTIONS": [
+        "Customer can't log in to the patient portal",
+        "Customer reports that appointment reminders aren't being sent"
+    ]
+}
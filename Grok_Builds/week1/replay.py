@@ -0,0 +1,111 @@
+"""
+replay.py
+=========
+A recorded-response store and a replaying version of SimpleAgent.
+
+Responses are recorded once against the real API and saved to a JSON file.
+Later runs replay them from the file, so evaluations are deterministic, free,
+and work offline.
+
+Author: Bradley Pierce
+Date Created: October 19, 2026
+"""
+
+# Import standard libraries
+import json  # For reading and writing the store file
+import os  # For checking whether the store file exists
+import threading  # For keeping the store safe when agents run in parallel
+# Import local modules
+from agent import SimpleAgent, prompt_key  # The AI agent class and request key helper
+
+class ReplayStore:
+    """
+    A JSON file of recorded LLM responses keyed by model, temperature, and prompt.
+
+    Each entry holds the raw response text plus the token usage and latency
+    that were observed when it was recorded.
+    """
+
+    def __init__(self, path: str):
+        """
+        Load the store from disk (an empty store is used if the file doesn't exist).
+
+        Args:
+            path (str): Path to the JSON store file.
+        """
+        self.path = path
+        # Lock so parallel agents can read and record safely
+        self._lock = threading.Lock()
+        self._entries = {}
+        if os.path.exists(path):
+            with open(path, "r", encoding="utf-8") as f:
+                self._entries = json.load(f)
+
+    def get(self, key: str):
+        """Return the recorded entry for a key, or None if it wasn't recorded."""
+        with self._lock:
+            return self._entries.get(key)
+
+    def put(self, key: str, entry: dict):
+        """Record an entry for a key (call save() to write it to disk)."""
+        with self._lock:
+            self._entries[key] = entry
+
+    def save(self):
+        """Write all recorded entries to the store file."""
+        with self._lock:
+            with open(self.path, "w", encoding="utf-8") as f:
+                json.dump(self._entries, f, indent=2, sort_keys=True)
+
+class ReplayAgent(SimpleAgent):
+    """
+    A SimpleAgent that answers from a ReplayStore instead of the live API.
+
+    In "replay" mode a missing recording is an error, so runs never touch the network.
+    In "record" mode missing recordings are fetched from the API and added to the store.
+    """
+
+    def __init__(self, api_key: str, store: ReplayStore, model: str = "gpt-3.5-turbo", mode: str = "replay"):
+        """
+        Initialize the agent with a store and replay mode.
+
+        Args:
+            api_key (str): OpenAI API key (only used in "record" mode; may be None for "replay").
+            store (ReplayStore): Where recorded responses are read from and written to.
+            model (str): The LLM model to use (default: gpt-3.5-turbo).
+            mode (str): "replay" (offline only) or "record" (fetch and save missing responses).
+        """
+        if mode not in ("replay", "record"):
+            raise ValueError(f"Unknown replay mode: {mode}")
+        super().__init__(api_key=api_key, model=model)
+        self.store = store
+        self.mode = mode
+
+    def complete(self, prompt: str, temperature: float = 0.0) -> str:
+        """
+        Return the recorded response text for a prompt, recording it first if needed.
+
+        The recorded token usage and latency are restored into `last_usage` and
+        `last_latency`, so replayed runs report the same numbers as the original call.
+        """
+        key = prompt_key(self.model, prompt, temperature)
+        entry = self.store.get(key)
+
+        if entry is None:
+            if self.mode == "replay":
+                raise Exception(f"No recorded response for model {self.model} (key {key[:12]}). Run in record mode first.")
+
+            # Call the real API and save what it returned
+            response_text = super().complete(prompt, temperature)
+            entry = {
+                "model": self.model,
+                "response_text": response_text,
+                "usage": self.last_usage,
+                "latency": self.last_latency
+            }
+            self.store.put(key, entry)
+            return response_text
+
+        self.last_usage = entry.get("usage")
+        self.last_latency = entry.get("latency")
+        return entry["response_text"]
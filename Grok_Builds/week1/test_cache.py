@@ -0,0 +1,81 @@
+"""
+test_cache.py
+=============
+Tests for the shared response cache in cache.py.
+
+These tests use a temporary cache file, so they run offline.
+
+How to Run:
+-----------
+From the Grok_Builds/week1 directory: python -m pytest -q test_cache.py
+"""
+
+# Import standard libraries
+import json  # For writing and inspecting the cache file
+import time  # For building old entries
+# Import third-party libraries
+import pytest  # For the test helpers
+# Import local modules
+from cache import ResponseCache, configured_max_age_hours
+
+def _on_disk(path) -> dict:
+    """Return the entries currently in the cache file."""
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+def test_put_then_get_round_trips_through_the_file(tmp_path):
+    path = str(tmp_path / "cache.json")
+    ResponseCache(path).put("k1", [{"question": "Q?"}], template="T", template_hash="h", num=1)
+    entry = ResponseCache(path).get("k1")
+    assert entry["result"] == [{"question": "Q?"}]
+    assert entry["template_hash"] == "h"
+    assert entry["num"] == 1
+
+def test_expired_entries_are_ignored_and_removed_on_save(tmp_path):
+    path = tmp_path / "cache.json"
+    old = {"result": [], "created_at": time.time() - 2 * 3600, "template": "T", "template_hash": "h"}
+    path.write_text(json.dumps({"old": old}), encoding="utf-8")
+
+    cache = ResponseCache(str(path), max_age_hours=1)
+    assert cache.get("old") is None
+    cache.put("new", [], template="T", template_hash="h")
+    assert set(_on_disk(path)) == {"new"}
+
+def test_size_is_capped_keeping_the_newest_entries(tmp_path):
+    path = str(tmp_path / "cache.json")
+    cache = ResponseCache(path, max_entries=3)
+    for i in range(5):
+        cache.put(f"k{i}", [], template="T", template_hash="h")
+    assert len(cache) == 3
+    assert set(_on_disk(path)) == {"k2", "k3", "k4"}
+
+def test_prune_removes_entries_from_edited_or_unknown_templates(tmp_path):
+    path = str(tmp_path / "cache.json")
+    cache = ResponseCache(path)
+    cache.put("current", [], template="T", template_hash="new")
+    cache.put("edited", [], template="T", template_hash="old")
+    cache.put("removed", [], template="GONE", template_hash="h")
+    assert cache.prune({"T": "new"}) == 2
+    assert set(_on_disk(path)) == {"current"}
+
+def test_writers_reread_the_file_so_updates_and_prunes_stick(tmp_path):
+    path = str(tmp_path / "cache.json")
+    job = ResponseCache(path)
+    app = ResponseCache(path)
+
+    job.put("k1", [], template="T", template_hash="h")
+    assert app.get("k1") is not None  # The app has now seen k1
+    job.prune({"T": "other"})
+    app.put("k2", [], template="T", template_hash="other")
+
+    # k2 didn't overwrite the prune (k1 stays gone), and nothing was lost
+    assert set(_on_disk(path)) == {"k2"}
+
+def test_max_age_comes_from_the_environment(monkeypatch, tmp_path):
+    monkeypatch.setenv("RESPONSE_CACHE_MAX_AGE_HOURS", "48")
+    assert ResponseCache(str(tmp_path / "cache.json")).max_age_hours == 48
+    monkeypatch.setenv("RESPONSE_CACHE_MAX_AGE_HOURS", "soon")
+    with pytest.raises(ValueError):
+        configured_max_age_hours()
+    monkeypatch.delenv("RESPONSE_CACHE_MAX_AGE_HOURS")
+    assert configured_max_age_hours() == 24
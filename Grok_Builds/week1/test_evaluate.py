@@ -0,0 +1,88 @@
+"""
+test_evaluate.py
+================
+Tests for the eval harness (evaluate.py) and the recorded-response replay (replay.py).
+
+These tests replay recordings from a temporary store, so they run offline.
+
+How to Run:
+-----------
+From the Grok_Builds/week1 directory: python -m pytest -q test_evaluate.py
+"""
+
+# Import third-party libraries
+import pytest  # For the test helpers
+
+# agent.py imports openai, so skip these tests if it isn't installed
+pytest.importorskip("openai")
+
+# Import standard libraries
+import json  # For building recorded responses
+# Import local modules
+from agent import prompt_key
+from evaluate import build_case_prompt, find_missing_recordings, load_dataset, percentile, run_eval, summarize
+from replay import ReplayAgent, ReplayStore
+
+TEMPLATE = "HEALTHCARE_QUALIFYING_QUESTIONS"
+MODEL = "test-model"
+CASES = [
+    {"input": "Client needs help with compliance", "num": 3},
+    {"input": "Client has a staffing shortage", "num": 3},
+    {"input": "Client has a claims backlog", "num": 3},
+]
+
+def _items(count: int) -> str:
+    """Return a JSON response with `count` question items."""
+    return json.dumps([{"question": "Q?", "explanation": "Why."}] * count)
+
+def _record(store: ReplayStore, case: dict, response_text: str, latency: float):
+    """Record a response for one case, as record mode would."""
+    key = prompt_key(MODEL, build_case_prompt(TEMPLATE, MODEL, case))
+    usage = {"prompt_tokens": 100, "completion_tokens": 50, "total_tokens": 150}
+    store.put(key, {"model": MODEL, "response_text": response_text, "usage": usage, "latency": latency})
+
+@pytest.fixture
+def store(tmp_path):
+    """A saved store with one valid, one short-count, and one non-JSON recording."""
+    store = ReplayStore(str(tmp_path / "recordings.json"))
+    _record(store, CASES[0], _items(3), 1.0)
+    _record(store, CASES[1], _items(2), 2.0)
+    _record(store, CASES[2], "Sorry, I can't answer in JSON.", 3.0)
+    store.save()
+    return ReplayStore(store.path)
+
+def test_summary_scores_parse_failures_compliance_and_latency(store):
+    records = run_eval(CASES, [TEMPLATE], [MODEL], store, max_workers=3)
+    assert [r["status"] for r in records] == ["ok", "ok", "parse_error"]
+
+    [row] = summarize(records)
+    assert row["runs"] == 3
+    assert row["parse_failure_rate"] == pytest.approx(1 / 3)
+    assert row["count_compliance"] == pytest.approx(1 / 3)
+    assert row["error_rate"] == 0
+    assert row["latency_p50"] == 2.0
+    assert row["latency_p95"] == 3.0
+    assert row["latency_max"] == 3.0
+    assert row["total_tokens"] == 450
+
+def test_percentile_uses_nearest_rank():
+    assert percentile([], 50) is None
+    assert percentile([5.0], 95) == 5.0
+    assert percentile([4.0, 1.0, 3.0, 2.0], 50) == 2.0
+    assert percentile([4.0, 1.0, 3.0, 2.0], 95) == 4.0
+
+def test_replay_mode_miss_raises(store):
+    agent = ReplayAgent(api_key=None, store=store, model=MODEL, mode="replay")
+    with pytest.raises(Exception, match="No recorded response"):
+        agent.generate("A prompt that was never recorded")
+
+def test_missing_recordings_are_reported_before_running(store):
+    missing = find_missing_recordings(CASES, [TEMPLATE], [MODEL, "other-model"], store)
+    assert [model for _, model, _ in missing] == ["other-model"] * 3
+    assert find_missing_recordings(CASES, [TEMPLATE], [MODEL], store) == []
+
+def test_empty_dataset_is_rejected(tmp_path):
+    path = tmp_path / "empty.json"
+    path.write_text("[]", encoding="utf-8")
+    with pytest.raises(ValueError, match="non-empty"):
+        load_dataset(str(path))
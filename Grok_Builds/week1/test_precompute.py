@@ -0,0 +1,141 @@
+"""
+test_precompute.py
+==================
+Tests for the cache pre-warming job (precompute.py) and how SimpleAgent serves its results.
+
+The agent's API call is replaced with a stub and the cache uses a temporary file,
+so these tests run offline.
+
+How to Run:
+-----------
+From the Grok_Builds/week1 directory: python -m pytest -q test_precompute.py
+"""
+
+# Import third-party libraries
+import pytest  # For the test helpers
+
+# agent.py imports openai and precompute.py imports dotenv, so skip these tests without them
+pytest.importorskip("openai")
+pytest.importorskip("dotenv")
+
+# Import standard libraries
+import json  # For building stub responses
+import re  # For reading the requested count out of a prompt
+import time  # For entry timestamps
+# Import local modules
+import precompute
+import prompts
+from agent import SimpleAgent, prompt_key
+from cache import ResponseCache
+
+MODEL = "test-model"
+TEMPLATE = "HEALTHCARE_QUALIFYING_QUESTIONS"
+SITUATION = "Client is preparing for a HIPAA compliance audit"
+CATALOG = {TEMPLATE: [SITUATION]}
+
+def stub_agent(short_by: int = 0) -> SimpleAgent:
+    """
+    Return an agent whose API call is stubbed to answer with the requested number of items.
+
+    Args:
+        short_by (int): Return this many fewer items than requested.
+    """
+    agent = SimpleAgent(api_key="test", model=MODEL)
+    agent.calls = 0
+
+    def complete(prompt, temperature=0.0):
+        agent.calls += 1
+        num = int(re.search(r"exactly (\d+)", prompt).group(1))
+        agent.last_usage = {"prompt_tokens": 100, "completion_tokens": 100, "total_tokens": 200}
+        return json.dumps([{"question": "Q?", "explanation": "Why."}] * (num - short_by))
+
+    agent.complete = complete
+    return agent
+
+@pytest.fixture
+def cache(tmp_path):
+    return ResponseCache(str(tmp_path / "cache.json"), max_age_hours=24)
+
+def test_pass_then_app_style_request_is_served_warm(cache):
+    job = stub_agent()
+    stats = precompute.precompute(job, cache, catalog=CATALOG, nums=[5, 10], pause=0)
+    assert stats["generated"] == 2
+    assert job.calls == 2
+
+    # The app builds the same prompt and gets the pre-warmed answer without an API call
+    app = stub_agent()
+    app.cache = cache
+    prompt = precompute.build_prompt(TEMPLATE, SITUATION, 10, MODEL)
+    assert len(app.generate(prompt)) == 10
+    assert app.calls == 0
+    assert app.last_from_cache is True
+
+    # Skipping the cache calls the API again
+    app.generate(prompt, use_cache=False)
+    assert app.calls == 1
+    assert app.last_from_cache is False
+
+def test_agent_ignores_entries_not_written_by_precompute(cache):
+    # An entry without a template hash (e.g., left over from an older version) is never served
+    prompt = "Generate exactly 3 questions for a pasted situation"
+    with open(cache.path, "w", encoding="utf-8") as f:
+        json.dump({prompt_key(MODEL, prompt): {"result": [], "created_at": time.time()}}, f)
+    app = stub_agent()
+    app.cache = cache
+    app.generate(prompt)
+    assert app.calls == 1
+
+def test_second_pass_skips_fresh_entries(cache):
+    precompute.precompute(stub_agent(), cache, catalog=CATALOG, nums=[5], pause=0)
+    job = stub_agent()
+    stats = precompute.precompute(job, cache, catalog=CATALOG, nums=[5], pause=0)
+    assert stats["fresh"] == 1
+    assert stats["generated"] == 0
+    assert job.calls == 0
+
+def test_pass_stops_when_the_token_budget_runs_out(cache):
+    job = stub_agent()
+    catalog = {TEMPLATE: prompts.PRECOMPUTE_CATALOG[TEMPLATE]}
+    # Each call estimates roughly 150 + 5 * 60 tokens, so only one fits
+    stats = precompute.precompute(job, cache, catalog=catalog, nums=[5], token_budget=600, pause=0)
+    assert stats["budget_exhausted"] is True
+    assert stats["generated"] == 1
+    assert job.calls == 1
+
+def test_wrong_item_count_is_not_cached(cache):
+    stats = precompute.precompute(stub_agent(short_by=1), cache, catalog=CATALOG, nums=[5], pause=0)
+    assert stats["failed"] == 1
+    assert stats["generated"] == 0
+    assert len(cache) == 0
+
+def test_template_edit_prunes_old_entries_and_regenerates(cache, monkeypatch):
+    precompute.precompute(stub_agent(), cache, catalog=CATALOG, nums=[5], pause=0)
+    monkeypatch.setattr(prompts, TEMPLATE, getattr(prompts, TEMPLATE) + "\nKeep each question short.\n")
+
+    job = stub_agent()
+    stats = precompute.precompute(job, cache, catalog=CATALOG, nums=[5], pause=0)
+    assert stats["pruned"] == 1
+    assert stats["generated"] == 1
+    assert len(cache) == 1
+
+def test_catalog_name_without_a_template_is_skipped(cache, monkeypatch):
+    monkeypatch.setitem(prompts.PRECOMPUTE_CATALOG, "DELETED_TEMPLATE", ["Anything"])
+    job = stub_agent()
+    stats = precompute.precompute(job, cache, catalog={"DELETED_TEMPLATE": ["Anything"], **CATALOG}, nums=[5], pause=0)
+    assert stats["generated"] == 1
+    assert job.calls == 1
+
+def test_refresh_age_must_be_shorter_than_cache_max_age(cache):
+    with pytest.raises(ValueError, match="max age"):
+        precompute.precompute(stub_agent(), cache, catalog=CATALOG, refresh_hours=48, pause=0)
+
+def test_failed_reload_keeps_the_previous_prompts(monkeypatch):
+    catalog = prompts.PRECOMPUTE_CATALOG
+
+    def broken_reload(module):
+        module.PRECOMPUTE_CATALOG = {}  # Partly re-executed before failing
+        raise SyntaxError("half-saved file")
+
+    monkeypatch.setattr(precompute.importlib, "reload", broken_reload)
+    assert precompute.reload_prompts() is False
+    assert prompts.PRECOMPUTE_CATALOG is catalog
@@ -0,0 +1,82 @@
+"""
+test_tokens.py
+==============
+Tests for the input budgeting in tokens.py.
+
+These tests don't call the API, so they run offline.
+
+How to Run:
+-----------
+From the Grok_Builds/week1 directory: python -m pytest -q test_tokens.py
+"""
+
+# Import standard libraries
+import json  # For writing a recorded-response store
+# Import local modules
+import tokens
+from tokens import count_tokens, derive_chars_per_token, fit_input, trim_to_budget
+
+CLIENT_PROBLEM = "Our clinic is struggling with patient data management and HIPAA compliance."
+
+def test_under_budget_input_is_unchanged():
+    text = "  Client is struggling with patient data.\n\n> quoted line  "
+    trimmed, report = trim_to_budget(text, 800)
+    assert trimmed == text
+    assert report["trimmed"] is False
+    assert report["saved_tokens"] == 0
+
+def test_headers_and_quoted_replies_are_stripped():
+    text = "\n".join(
+        ["From: Jane <jane@clinic.org>", "Sent: Monday", "Subject: RE: compliance", CLIENT_PROBLEM, "", "On Fri, Bob wrote:"]
+        + ["> Quoted lunch plans from an older message in the thread."] * 100
+    )
+    trimmed, report = trim_to_budget(text, 20)
+    assert trimmed == CLIENT_PROBLEM
+    assert report["trimmed"] is True
+    assert report["final_tokens"] <= 20
+    assert report["saved_tokens"] == report["original_tokens"] - report["final_tokens"]
+
+def test_relevance_extraction_stays_within_budget_and_keeps_the_problem():
+    filler = [f"Other filler sentence about the weather today number {i}." for i in range(300)]
+    disclaimer = ["This email and any attachments are confidential."] * 50
+    text = "\n".join([CLIENT_PROBLEM] + disclaimer + filler)
+    trimmed, report = trim_to_budget(text, 100)
+    assert CLIENT_PROBLEM in trimmed
+    assert count_tokens(trimmed) <= 100
+    assert report["final_tokens"] <= 100
+
+def test_all_quoted_input_is_not_emptied():
+    text = "\n".join(["On Fri, Jane wrote:", "> " + CLIENT_PROBLEM] + ["> Sent from my phone, see attached notes."] * 200)
+    trimmed, report = trim_to_budget(text, 50)
+    assert trimmed
+    assert "HIPAA compliance" in trimmed
+    assert not trimmed.startswith(">")
+    assert 0 < report["final_tokens"] <= 50
+
+def test_long_subject_line_is_not_emptied():
+    text = "Subject: " + " ".join(["Client needs help with claims denials and staffing."] * 100)
+    trimmed, report = trim_to_budget(text, 50)
+    assert "claims denials" in trimmed
+    assert 0 < report["final_tokens"] <= 50
+
+def test_trimming_is_deterministic():
+    text = "\n".join([CLIENT_PROBLEM] + [f"Filler sentence {i} about nothing in particular." for i in range(500)])
+    assert fit_input(text, "HEALTHCARE_QUALIFYING_QUESTIONS") == fit_input(text, "HEALTHCARE_QUALIFYING_QUESTIONS")
+
+def test_heuristic_uses_each_models_calibrated_ratio(monkeypatch):
+    # Force the heuristic path even if tiktoken is installed
+    monkeypatch.setattr(tokens, "_get_encoding", lambda model: None)
+    text = "x" * 4100
+    assert count_tokens(text, "gpt-4o") == round(4100 / tokens.CHARS_PER_TOKEN["gpt-4o"])
+    assert count_tokens(text, "unknown-model") == round(4100 / tokens.DEFAULT_CHARS_PER_TOKEN)
+    assert count_tokens(text, "unknown-model") > count_tokens(text, "gpt-4o")
+
+def test_derive_chars_per_token_from_recordings(tmp_path):
+    store = {
+        "a": {"model": "m1", "response_text": "x" * 300, "usage": {"completion_tokens": 100}},
+        "b": {"model": "m1", "response_text": "x" * 500, "usage": {"completion_tokens": 100}},
+        "c": {"model": "m2", "response_text": "x" * 90, "usage": None},
+    }
+    path = tmp_path / "recordings.json"
+    path.write_text(json.dumps(store), encoding="utf-8")
+    assert derive_chars_per_token(str(path)) == {"m1": 4.0}
@@ -0,0 +1,331 @@
+"""
+tokens.py
+=========
+Local token counting and input budgeting for prompt templates.
+
+Users sometimes paste whole email threads as the client situation. This module
+estimates token counts locally (no API call) and trims the {input} to a
+per-template budget before the prompt is formatted, keeping the most relevant part.
+
+Token counts use the model's real vocabulary when `tiktoken` is installed
+(it's in requirements.txt). Otherwise a characters-per-token ratio for the model
+is used, from the CHARS_PER_TOKEN table below. The table is calibrated offline
+from recorded API usage (see derive_chars_per_token()) and shipped with the code,
+so the same input is always trimmed the same way, in every process, and prompts
+(and cache keys) built by the app, CLI, eval harness, and precompute job match.
+
+How to Recalibrate:
+-------------------
+1. Record responses with the eval harness: python evaluate.py --mode record --models ...
+2. Print the measured ratios: python tokens.py eval_recordings.json
+3. Copy the printed values into CHARS_PER_TOKEN.
+
+Author: Bradley Pierce
+Date Created: October 19, 2026
+"""
+
+# Import standard libraries
+import json  # For reading recorded responses when calibrating
+import math  # For keyword weights
+import re  # For cleaning text and splitting it into sentences
+import sys  # For the calibration command-line entry point
+from collections import Counter  # For counting keyword frequencies
+from functools import lru_cache  # For caching each model's vocabulary
+# Import local modules
+import prompts  # Per-template input budgets (read at call time so reloads are picked up)
+
+# Average characters per token for each model's tokenizer, used when tiktoken isn't available
+# Models on the newer o200k vocabulary (gpt-4o family) fit more characters in each token
+# Recalibrate from recorded usage with `python tokens.py eval_recordings.json`
+CHARS_PER_TOKEN = {
+    "gpt-3.5-turbo": 3.8,
+    "gpt-4": 3.8,
+    "gpt-4-turbo": 3.8,
+    "gpt-4o": 4.1,
+    "gpt-4o-mini": 4.1
+}
+
+# Ratio for models not in the table; on the low side so unknown models
+# (and non-English or code-heavy text) are over-counted rather than under-counted
+DEFAULT_CHARS_PER_TOKEN = 3.5
+
+# If stripping email noise leaves less than this share of the budget, the client's
+# own words were probably in the quoted part, so relevance extraction runs on the
+# whole text instead
+MIN_STRIPPED_SHARE = 0.1
+
+# Quoted reply lines (e.g., "> We need help with...")
+_QUOTE_PREFIX = re.compile(r"^\s*(>\s*)+")
+
+# Email header lines; the subject is kept when unquoting since it can describe the problem
+_HEADER_LINE = re.compile(r"^\s*(from|to|cc|bcc|sent|date|reply-to):", re.IGNORECASE)
+_SUBJECT_PREFIX = re.compile(r"^\s*subject:\s*", re.IGNORECASE)
+
+# Reply markers and forwarding banners
+_BANNER_LINES = [
+    re.compile(r"^\s*on .+ wrote:\s*$", re.IGNORECASE),
+    re.compile(r"^\s*-{2,}\s*(original message|forwarded message)\s*-{2,}\s*$", re.IGNORECASE),
+]
+
+# Common words that shouldn't count toward a sentence's relevance
+_STOPWORDS = {
+    "a", "an", "and", "are", "as", "at", "be", "been", "but", "by", "can", "do", "for",
+    "from", "had", "has", "have", "i", "if", "in", "is", "it", "its", "me", "my", "not",
+    "of", "on", "or", "our", "so", "that", "the", "their", "them", "there", "they", "this",
+    "to", "us", "was", "we", "were", "what", "will", "with", "would", "you", "your"
+}
+
+@lru_cache(maxsize=None)
+def _get_encoding(model: str):
+    """
+    Load (once per model) the tiktoken encoding for a model.
+
+    Returns:
+        The encoding, or None if tiktoken isn't installed or the vocabulary can't be loaded.
+    """
+    try:
+        import tiktoken  # Optional dependency
+    except ImportError:
+        return None
+
+    try:
+        return tiktoken.encoding_for_model(model)
+    except KeyError:
+        # Unknown model name; fall back to the encoding used by current chat models
+        try:
+            return tiktoken.get_encoding("cl100k_base")
+        except Exception:
+            return None
+    except Exception:
+        # The vocabulary file couldn't be downloaded (e.g., offline)
+        return None
+
+def chars_per_token(model: str) -> float:
+    """Return the calibrated characters-per-token ratio for a model."""
+    return CHARS_PER_TOKEN.get(model, DEFAULT_CHARS_PER_TOKEN)
+
+def derive_chars_per_token(store_path: str) -> dict:
+    """
+    Measure each model's characters-per-token ratio from recorded responses.
+
+    Uses the eval harness's recorded-response store (see replay.py): each recording
+    has the response text and the completion_tokens the API reported for it.
+
+    Args:
+        store_path (str): Path to the recorded-response store (e.g., eval_recordings.json).
+
+    Returns:
+        dict: Model name -> measured characters per token (rounded to 2 places).
+    """
+    with open(store_path, "r", encoding="utf-8") as f:
+        entries = json.load(f)
+
+    chars = Counter()
+    tokens = Counter()
+    for entry in entries.values():
+        usage = entry.get("usage") or {}
+        if entry.get("model") and entry.get("response_text") and usage.get("completion_tokens"):
+            chars[entry["model"]] += len(entry["response_text"])
+            tokens[entry["model"]] += usage["completion_tokens"]
+
+    return {model: round(chars[model] / tokens[model], 2) for model in sorted(tokens)}
+
+def count_tokens(text: str, model: str = "gpt-3.5-turbo") -> int:
+    """
+    Count (or estimate) the number of tokens in a piece of text.
+
+    Args:
+        text (str): The text to measure.
+        model (str): The LLM model whose tokenizer should be used.
+
+    Returns:
+        int: The exact count if tiktoken is available, otherwise an estimate.
+    """
+    if not text:
+        return 0
+    encoding = _get_encoding(model)
+    if encoding is not None:
+        return len(encoding.encode(text))
+    return max(1, round(len(text) / chars_per_token(model)))
+
+def get_input_budget(template_name: str) -> int:
+    """Return the {input} token budget for a template name from prompts.py."""
+    return prompts.INPUT_TOKEN_BUDGETS.get(template_name, prompts.DEFAULT_INPUT_TOKEN_BUDGET)
+
+def _is_banner(line: str) -> bool:
+    """Return True for email header lines, reply markers, and forwarding banners."""
+    return bool(_HEADER_LINE.match(line)) or any(pattern.match(line) for pattern in _BANNER_LINES)
+
+def _collapse_whitespace(lines: list) -> str:
+    """Join lines, collapsing runs of blank lines and spaces."""
+    cleaned = "\n".join(line.strip() for line in lines)
+    cleaned = re.sub(r"\n{3,}", "\n\n", cleaned)
+    cleaned = re.sub(r"[ \t]+", " ", cleaned)
+    return cleaned.strip()
+
+def _strip_noise(text: str) -> str:
+    """Remove quoted replies, email headers (including the subject), and extra blank space."""
+    return _collapse_whitespace([
+        line for line in text.splitlines()
+        if not _is_banner(line) and not _QUOTE_PREFIX.match(line) and not _SUBJECT_PREFIX.match(line)
+    ])
+
+def _unquote(text: str) -> str:
+    """
+    Remove reply markers from pasted text but keep the quoted content.
+
+    Header lines and banners are dropped, "> " prefixes and the "Subject:" label
+    are removed, and the text of quoted messages and the subject is kept.
+    """
+    return _collapse_whitespace([
+        _SUBJECT_PREFIX.sub("", _QUOTE_PREFIX.sub("", line))
+        for line in text.splitlines()
+        if not _is_banner(_QUOTE_PREFIX.sub("", line))
+    ])
+
+def _split_sentences(text: str) -> list:
+    """Split text into sentences (paragraph breaks also end a sentence)."""
+    parts = re.split(r"(?<=[.!?])\s+|\n\s*\n", text)
+    return [part.strip() for part in parts if part and part.strip()]
+
+def _content_words(text: str) -> list:
+    """Return the lowercase words in text, minus stopwords and very short words."""
+    return [
+        word for word in re.findall(r"[a-z0-9']+", text.lower())
+        if len(word) > 2 and word not in _STOPWORDS
+    ]
+
+def _truncate(text: str, budget: int, model: str) -> str:
+    """Cut text down to at most `budget` tokens."""
+    encoding = _get_encoding(model)
+    if encoding is not None:
+        return encoding.decode(encoding.encode(text)[:budget])
+    return text[:int(budget * chars_per_token(model))]
+
+def _extract_relevant(text: str, budget: int, model: str) -> str:
+    """
+    Keep the most relevant sentences of text that fit within the budget.
+
+    Words are weighted TF-IDF style: a word counts more the more often it appears
+    in the text, but less the more sentences it appears in, so repeated boilerplate
+    (greetings, signatures, disclaimers) scores low. Sentences get a bonus for
+    appearing early (the newest message is at the top of a thread). Duplicate
+    sentences are dropped, and the chosen ones are returned in their original order.
+    """
+    # Split into sentences, skipping exact repeats
+    sentences = []
+    seen = set()
+    for sentence in _split_sentences(text):
+        if sentence.lower() not in seen:
+            seen.add(sentence.lower())
+            sentences.append(sentence)
+    if not sentences:
+        return ""
+
+    sentence_words = [_content_words(sentence) for sentence in sentences]
+    term_counts = Counter(word for words in sentence_words for word in words)
+    sentence_counts = Counter(word for words in sentence_words for word in set(words))
+    weights = {
+        word: math.log(1 + term_counts[word]) * math.log(1 + len(sentences) / sentence_counts[word])
+        for word in term_counts
+    }
+
+    scored = []
+    for position, (sentence, words) in enumerate(zip(sentences, sentence_words)):
+        keyword_score = sum(weights[word] for word in set(words)) / math.sqrt(len(words)) if words else 0.0
+        position_bonus = 1.0 - position / len(sentences)
+        scored.append((keyword_score * (1.0 + position_bonus), position, sentence))
+
+    # Greedily add the highest-scoring sentences that still fit
+    chosen = []
+    used = 0
+    for _, position, sentence in sorted(scored, key=lambda item: (-item[0], item[1])):
+        # Count the joining space as part of the cost
+        cost = count_tokens(sentence, model) + (1 if chosen else 0)
+        if used + cost <= budget:
+            chosen.append((position, sentence))
+            used += cost
+
+    if not chosen:
+        # Even the best sentence is too long on its own; keep its beginning
+        best_sentence = min(scored, key=lambda item: (-item[0], item[1]))[2]
+        return _truncate(best_sentence, budget, model)
+
+    return " ".join(sentence for _, sentence in sorted(chosen))
+
+def trim_to_budget(text: str, budget: int, model: str = "gpt-3.5-turbo") -> tuple:
+    """
+    Trim text to at most `budget` tokens, keeping the most relevant portion.
+
+    Text already within budget is returned unchanged. Otherwise email noise is
+    stripped first, and if that isn't enough the most relevant sentences are kept.
+    If stripping leaves almost nothing (the text was mostly quoted replies or
+    headers), the most relevant sentences are picked from the unquoted text instead.
+
+    Args:
+        text (str): The user's input (e.g., a pasted email thread).
+        budget (int): The maximum number of tokens to keep.
+        model (str): The LLM model whose tokenizer should be used.
+
+    Returns:
+        tuple: (trimmed_text, report) where report is a dict with
+            original_tokens, final_tokens, saved_tokens, trimmed, and exact
+            (True if counts came from the model's real vocabulary).
+    """
+    original_tokens = count_tokens(text, model)
+    trimmed_text = text
+
+    if original_tokens > budget:
+        trimmed_text = _strip_noise(text)
+        stripped_tokens = count_tokens(trimmed_text, model)
+        if stripped_tokens < budget * MIN_STRIPPED_SHARE:
+            # Almost everything was quoted or in headers (e.g., a reply chain where the
+            # client's own message is quoted), so pick from the unquoted whole text
+            trimmed_text = _extract_relevant(_unquote(text), budget, model)
+        elif stripped_tokens > budget:
+            trimmed_text = _extract_relevant(trimmed_text, budget, model)
+
+        # Never send an empty situation; keep the start of the original instead
+        if not trimmed_text:
+            trimmed_text = _truncate(text.strip(), budget, model)
+
+    final_tokens = count_tokens(trimmed_text, model)
+    report = {
+        "original_tokens": original_tokens,
+        "final_tokens": final_tokens,
+        "saved_tokens": original_tokens - final_tokens,
+        "trimmed": trimmed_text != text,
+        "exact": _get_encoding(model) is not None
+    }
+    return trimmed_text, report
+
+def fit_input(text: str, template_name: str, model: str = "gpt-3.5-turbo") -> tuple:
+    """
+    Trim a user's input to the budget of the template it will be formatted into.
+
+    Args:
+        text (str): The user's input.
+        template_name (str): The template's variable name in prompts.py.
+        model (str): The LLM model whose tokenizer should be used.
+
+    Returns:
+        tuple: (trimmed_text, report), as returned by trim_to_budget().
+    """
+    return trim_to_budget(text, get_input_budget(template_name), model)
+
+if __name__ == "__main__":
+    """
+    Entry point of the script.
+
+    Prints calibrated CHARS_PER_TOKEN entries from a recorded-response store,
+    e.g., `python tokens.py eval_recordings.json`.
+    """
+    if len(sys.argv) < 2:
+        print("Usage: python tokens.py path/to/eval_recordings.json")
+        sys.exit(1)
+    ratios = derive_chars_per_token(sys.argv[1])
+    if not ratios:
+        print("No recordings with token usage found.")
+        sys.exit(1)
+    for model, ratio in ratios.items():
+        print(f'    "{model}": {ratio},')